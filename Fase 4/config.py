@@ -17,11 +17,13 @@ import os
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR = os.path.join(BASE_DIR, "data")
 MODELS_DIR = os.path.join(BASE_DIR, "models")
+CACHE_DIR = os.path.join(BASE_DIR, "cache")
 
 # Cria os diretórios automaticamente se não existirem
 # Isso garante que o sistema funcione mesmo sem estrutura pré-existente
 os.makedirs(DATA_DIR, exist_ok=True)
 os.makedirs(MODELS_DIR, exist_ok=True)
+os.makedirs(CACHE_DIR, exist_ok=True)
 
 # Caminho completo para o arquivo de dados padrão
 # O sistema tentará carregar este arquivo automaticamente na inicialização
@@ -42,6 +44,11 @@ WEATHER_API_KEY = ""  # Não utilizado - mantido para compatibilidade
 # URL da API Open-Meteo para previsão meteorológica
 WEATHER_API_URL = "https://api.open-meteo.com/v1/forecast"
 
+# Validade (em segundos) do cache de previsões em disco
+# Previsões meteorológicas mudam a cada poucas horas; dentro desta janela,
+# consultas repetidas para a mesma cidade não vão à rede
+WEATHER_CACHE_TTL_SECONDS = 3600
+
 # Lista de municípios cadastrados no sistema
 MUNICIPIOS_CADASTRADOS = [
     "São Paulo",
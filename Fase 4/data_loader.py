@@ -212,3 +212,62 @@ class DataLoader:
             },
             "colunas": self.df.columns.tolist(),
         }
+
+
+class SharedPreprocessor:
+    """
+    Pré-processador compartilhado entre pipelines que usam as mesmas features.
+
+    Quando mais de um pipeline treina sobre o mesmo X (alvos diferentes
+    derivados da mesma base), cada um refazer o train_test_split e ajustar o
+    próprio StandardScaler custa duas passadas completas sobre os dados e
+    duplica arrays em memória. Como RANDOM_STATE e TEST_SIZE são globais, as
+    partições de linhas seriam idênticas de qualquer forma — este helper faz
+    o split e a normalização uma única vez e entrega os arrays prontos para
+    serem passados via parâmetro preprocessed de train_models.
+    """
+
+    def __init__(self):
+        """
+        Inicializa o pré-processador.
+
+        Atributos:
+        - scaler: StandardScaler ajustado no último fit_transform (None até lá)
+        """
+        self.scaler = None
+
+    def fit_transform(self, X, *targets):
+        """
+        Divide e normaliza X uma única vez para um ou mais alvos.
+
+        Args:
+            X: DataFrame ou array com features
+            *targets: Uma ou mais variáveis alvo alinhadas a X
+
+        Returns:
+            Tupla (X_train_scaled, X_test_scaled, y_train, y_test, ...,
+            scaler), com um par train/test por alvo informado e o scaler
+            ajustado ao final
+        """
+        # Imports locais: mantém o módulo leve para quem só carrega dados
+        from sklearn.model_selection import train_test_split
+        from sklearn.preprocessing import StandardScaler
+
+        splits = train_test_split(
+            X, *targets, test_size=config.TEST_SIZE, random_state=config.RANDOM_STATE
+        )
+        X_train, X_test = splits[0], splits[1]
+
+        # Mesma convenção dos pipelines de treino: float32 contíguo
+        X_train = np.ascontiguousarray(
+            X_train.values if hasattr(X_train, "values") else X_train, dtype=np.float32
+        )
+        X_test = np.ascontiguousarray(
+            X_test.values if hasattr(X_test, "values") else X_test, dtype=np.float32
+        )
+
+        self.scaler = StandardScaler()
+        X_train_scaled = self.scaler.fit_transform(X_train)
+        X_test_scaled = self.scaler.transform(X_test)
+
+        return (X_train_scaled, X_test_scaled, *splits[2:], self.scaler)
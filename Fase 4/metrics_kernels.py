@@ -0,0 +1,77 @@
+"""
+Kernels Numéricos para Métricas de Avaliação
+
+Este módulo concentra o cálculo das métricas de regressão (MAE, MSE, RMSE e R²)
+em um único kernel de passada única sobre os arrays. Quando o Numba está
+instalado, o kernel é compilado com @njit (cache=True evita recompilar a cada
+execução), fundindo resíduo, quadrado, soma e divisão em um único loop
+vetorizado. Sem Numba, uma versão NumPy equivalente é usada como fallback.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+
+def _reg_metrics_loop(y, yhat):
+    """
+    Kernel de passada única para métricas de regressão.
+
+    Escrito como loop explícito para que o Numba possa fundir todas as
+    operações (resíduo, valor absoluto, quadrado e somas) em um único
+    passe SIMD sobre os dados, sem arrays temporários.
+
+    Args:
+        y: Array 1-D float64 com valores reais
+        yhat: Array 1-D float64 com valores previstos
+
+    Returns:
+        Tupla (MAE, MSE, RMSE, R²)
+    """
+    n = y.shape[0]
+    s_abs = 0.0
+    s_sq = 0.0
+    s_y = 0.0
+    for i in range(n):
+        r = y[i] - yhat[i]
+        s_abs += abs(r)
+        s_sq += r * r
+        s_y += y[i]
+    mae = s_abs / n
+    mse = s_sq / n
+    mean_y = s_y / n
+    ss_tot = 0.0
+    for i in range(n):
+        d = y[i] - mean_y
+        ss_tot += d * d
+    # Mesma convenção do sklearn: R² = 0 quando a variância total é nula
+    r2 = 1.0 - s_sq / ss_tot if ss_tot > 0.0 else 0.0
+    return mae, mse, np.sqrt(mse), r2
+
+
+def _reg_metrics_numpy(y, yhat):
+    """
+    Fallback vetorizado em NumPy puro (usado quando Numba não está instalado).
+
+    Args e retorno idênticos a _reg_metrics_loop.
+    """
+    resid = y - yhat
+    n = y.shape[0]
+    mae = float(np.abs(resid).sum()) / n
+    s_sq = float(resid @ resid)
+    mse = s_sq / n
+    ss_tot = float(np.square(y - y.mean()).sum())
+    r2 = 1.0 - s_sq / ss_tot if ss_tot > 0.0 else 0.0
+    return mae, mse, np.sqrt(mse), r2
+
+
+if _HAS_NUMBA:
+    reg_metrics = njit(cache=True, fastmath=True)(_reg_metrics_loop)
+    # Pré-aquecimento: chamada mínima no import paga o custo de compilação
+    # uma única vez, em vez de atrasar a primeira avaliação de modelo
+    reg_metrics(np.array([0.0, 1.0]), np.array([0.0, 1.0]))
+else:
+    reg_metrics = _reg_metrics_numpy
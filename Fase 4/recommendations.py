@@ -10,8 +10,205 @@ justificativa técnica explicando o motivo da decisão.
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from functools import lru_cache
 import config
 
+try:
+    import numba as nb
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+# Nomes dos dias da semana em português, indexados por datetime.weekday()
+_WEEKDAYS_PT = ("Segunda", "Terça", "Quarta", "Quinta", "Sexta", "Sábado", "Domingo")
+
+# Tabelas de templates de justificativa, pré-compiladas no import e indexadas
+# por categoria (calculada via np.digitize), eliminando a cascata de ifs e as
+# f-strings por branch; None marca categorias que não geram texto
+_JUST_UMIDADE_TPL = (
+    "Umidade crítica ({:.1f}%) - risco de estresse hídrico",
+    "Umidade abaixo do ideal ({:.1f}%)",
+    "Umidade adequada ({:.1f}%)",
+)
+_JUST_PROB_TPL = (
+    None,
+    "Probabilidade moderada de chuva ({:.1f}%)",
+    "Alta probabilidade de chuva ({:.1f}%)",
+)
+_JUST_CHUVA_TPL = (
+    None,
+    "Volume de chuva significativo ({:.1f}mm)",
+)
+
+
+def _build_justifications(umidade, prob_chuva, chuva_mm):
+    """
+    Gera as justificativas técnicas de um lote de dias.
+
+    As categorias de cada eixo (umidade, probabilidade e volume de chuva)
+    são calculadas vetorialmente com np.digitize sobre os mesmos limiares da
+    versão escalar; resta um único loop Python apertado com um .format por
+    template escolhido.
+
+    Args:
+        umidade: Array de umidades do solo previstas (%)
+        prob_chuva: Array de probabilidades de chuva (%)
+        chuva_mm: Array de volumes de chuva previstos (mm)
+
+    Returns:
+        Lista de strings de justificativa, uma por dia
+    """
+    cat_umidade = np.digitize(umidade, (20.0, 30.0))
+    cat_prob = np.digitize(prob_chuva, (50.0, 70.0), right=True)
+    cat_chuva = np.digitize(chuva_mm, (5.0,), right=True)
+
+    justificativas = []
+    for i in range(len(umidade)):
+        partes = [_JUST_UMIDADE_TPL[cat_umidade[i]].format(umidade[i])]
+
+        tpl_prob = _JUST_PROB_TPL[cat_prob[i]]
+        if tpl_prob is not None:
+            partes.append(tpl_prob.format(prob_chuva[i]))
+
+        tpl_chuva = _JUST_CHUVA_TPL[cat_chuva[i]]
+        if tpl_chuva is not None:
+            partes.append(tpl_chuva.format(chuva_mm[i]))
+
+        justificativas.append(" | ".join(partes))
+
+    return justificativas
+
+
+@lru_cache(maxsize=512)
+def _day_name(date_str):
+    """
+    Converte "YYYY-MM-DD" no nome do dia da semana, com memoização.
+
+    O lru_cache evita repetir o strptime para datas já vistas (num cronograma
+    de 7 dias cada data aparece várias vezes entre re-renderizações).
+
+    Args:
+        date_str: Data no formato "YYYY-MM-DD"
+
+    Returns:
+        Nome do dia da semana em português ou string vazia se erro
+    """
+    try:
+        return _WEEKDAYS_PT[datetime.strptime(date_str, "%Y-%m-%d").weekday()]
+    except Exception:
+        return ""
+
+
+def _predict_umidity_kernel(temp, prob_chuva, chuva_mm, out):
+    """
+    Kernel escalar do modelo empírico de umidade, um dia por iteração.
+
+    Escrito como loop explícito para que o Numba funda as operações
+    (multiply-add + clamp) em uma única passada SIMD quando disponível.
+    Mesmos coeficientes de _predict_umidity_simplified.
+    """
+    for i in range(temp.shape[0]):
+        u = 30.0 - (temp[i] - 25.0) * 0.8 + chuva_mm[i] * 1.5 + prob_chuva[i] * 0.05
+        out[i] = min(50.0, max(10.0, u))
+    return out
+
+
+def _should_irrigate_kernel(umidade, prob_chuva, chuva_mm, out):
+    """
+    Kernel escalar da cascata de 4 regras de _should_irrigate.
+
+    A forma com branches é intencional: o Numba lineariza a cascata; sem
+    Numba este kernel não é usado (ver _should_irrigate_np).
+    """
+    for i in range(umidade.shape[0]):
+        # Regra 1: umidade adequada (> 30%) não irriga
+        if umidade[i] > 30.0:
+            out[i] = False
+        # Regra 2: chuva alta prevista supre a necessidade, não irriga
+        elif prob_chuva[i] > 70.0 and chuva_mm[i] > 5.0:
+            out[i] = False
+        # Regra 3: umidade crítica (< 20%) sempre irriga (estresse hídrico)
+        elif umidade[i] < 20.0:
+            out[i] = True
+        # Regra 4: umidade baixa com pouca chuva prevista irriga
+        elif umidade[i] < 30.0 and (prob_chuva[i] < 50.0 or chuva_mm[i] < 3.0):
+            out[i] = True
+        # Caso padrão: situação intermediária, monitorar
+        else:
+            out[i] = False
+    return out
+
+
+if _HAS_NUMBA:
+    _predict_umidity_kernel = nb.njit(cache=True, fastmath=True)(_predict_umidity_kernel)
+    _should_irrigate_kernel = nb.njit(cache=True)(_should_irrigate_kernel)
+    # Pré-aquecimento: paga o custo de compilação uma vez no import
+    _warm = np.zeros(1)
+    _predict_umidity_kernel(_warm, _warm, _warm, np.empty(1))
+    _should_irrigate_kernel(_warm, _warm, _warm, np.empty(1, dtype=np.bool_))
+
+
+def _predict_umidity_np(temp, prob_chuva, chuva_mm):
+    """
+    Forma vetorial de _predict_umidity_simplified para lotes de dias.
+
+    Com Numba usa o kernel compilado (uma passada, sem temporários); sem
+    Numba cai na expressão NumPy equivalente. Útil para rescoring de séries
+    históricas longas, onde o overhead de chamada por dia dominaria.
+
+    Args:
+        temp: Array de temperaturas previstas (°C)
+        prob_chuva: Array de probabilidades de chuva (%)
+        chuva_mm: Array de volumes de chuva previstos (mm)
+
+    Returns:
+        Array float64 com a umidade do solo prevista (%)
+    """
+    temp = np.ascontiguousarray(temp, dtype=np.float64)
+    prob_chuva = np.ascontiguousarray(prob_chuva, dtype=np.float64)
+    chuva_mm = np.ascontiguousarray(chuva_mm, dtype=np.float64)
+
+    if _HAS_NUMBA:
+        return _predict_umidity_kernel(temp, prob_chuva, chuva_mm, np.empty(temp.shape[0]))
+
+    return np.clip(
+        30.0 - (temp - 25.0) * 0.8 + chuva_mm * 1.5 + prob_chuva * 0.05,
+        10.0,
+        50.0,
+    )
+
+
+def _should_irrigate_np(umidade, prob_chuva, chuva_mm):
+    """
+    Forma vetorial de _should_irrigate para lotes de dias.
+
+    Args:
+        umidade: Array de umidades do solo previstas (%)
+        prob_chuva: Array de probabilidades de chuva (%)
+        chuva_mm: Array de volumes de chuva previstos (mm)
+
+    Returns:
+        Array booleano indicando, por dia, se deve irrigar
+    """
+    umidade = np.ascontiguousarray(umidade, dtype=np.float64)
+    prob_chuva = np.ascontiguousarray(prob_chuva, dtype=np.float64)
+    chuva_mm = np.ascontiguousarray(chuva_mm, dtype=np.float64)
+
+    if _HAS_NUMBA:
+        return _should_irrigate_kernel(
+            umidade, prob_chuva, chuva_mm, np.empty(umidade.shape[0], dtype=np.bool_)
+        )
+
+    return (
+        ~(umidade > 30.0)
+        & ~((prob_chuva > 70.0) & (chuva_mm > 5.0))
+        & (
+            (umidade < 20.0)
+            | ((umidade < 30.0) & ((prob_chuva < 50.0) | (chuva_mm < 3.0)))
+        )
+    )
+
+
 class IrrigationRecommendations:
     """
     Classe para gerar recomendações inteligentes de irrigação.
@@ -35,7 +232,8 @@ class IrrigationRecommendations:
         self.classification_model = classification_model
         self.weather_api = weather_api
     
-    def generate_recommendations(self, city, cultura, days=7):
+    def generate_recommendations(self, city, cultura, days=7, return_df=True,
+                                 as_arrow=False):
         """
         Gera recomendações de irrigação para os próximos N dias.
         
@@ -50,9 +248,19 @@ class IrrigationRecommendations:
             city: Nome da cidade para consulta meteorológica
             cultura: Cultura agrícola (SOJA, MILHO ou CAFÉ)
             days: Número de dias de previsão (padrão: 7)
-        
+            return_df: Se True (padrão) retorna DataFrame; se False retorna
+                lista de dicionários, poupando a construção do DataFrame para
+                consumidores que apenas iteram (ex.: st.table no dashboard)
+            as_arrow: Se True, retorna pyarrow.Table montada direto dos
+                arrays de coluna (zero-copy para as colunas numéricas). O
+                Streamlit serializa DataFrames via Arrow antes de enviar ao
+                navegador; entregar a Table pronta pula a construção do
+                DataFrame e a conversão. Requer pyarrow instalado (dependência
+                do próprio Streamlit); use .to_pandas() se precisar voltar a
+                DataFrame
+
         Returns:
-            DataFrame com recomendações contendo:
+            DataFrame (ou lista de dicionários) com recomendações contendo:
             - data: Data da recomendação
             - dia_semana: Nome do dia da semana
             - temperatura: Temperatura prevista
@@ -70,62 +278,75 @@ class IrrigationRecommendations:
         if weather_df is None or len(weather_df) == 0:
             return None
         
-        recommendations = []
-        
         # Obtém estágios fenológicos possíveis para a cultura
         # Diferentes estágios têm necessidades hídricas diferentes
         estagios = config.ESTAGIOS_POR_CULTURA.get(cultura, ["Vegetativo"])
-        
-        # Processa cada dia da previsão
-        for idx, row in weather_df.iterrows():
-            date = row["data"]
-            temp = row["temperatura"]
-            prob_chuva = row["probabilidade_chuva"]
-            chuva_mm = row["chuva_mm"]
-            
-            # Simula um estágio fenológico (em produção, isso viria de dados reais)
-            # Usa o estágio médio como aproximação
-            estagio = estagios[len(estagios) // 2]
-            
-            # Previsão simplificada de umidade do solo
-            # Em produção, isso usaria o modelo de regressão com todas as features
-            # Por enquanto, usa fórmula simplificada baseada em correlações típicas
-            try:
-                umidade_prevista = self._predict_umidity_simplified(
-                    temp, prob_chuva, chuva_mm
-                )
-            except:
-                # Fallback: estimativa simples baseada em regras empíricas
-                umidade_prevista = max(15, min(45, 30 - (temp - 25) * 0.5 + chuva_mm * 2))
-            
-            # Aplica regras de negócio para decidir se deve irrigar
-            deve_irrigar = self._should_irrigate(umidade_prevista, prob_chuva, chuva_mm)
-            
-            # Gera texto descritivo da recomendação
-            recomendacao = self._generate_recommendation_text(
-                umidade_prevista, prob_chuva, chuva_mm, deve_irrigar
-            )
-            
-            # Define horário recomendado (madrugada é mais eficiente para irrigação)
-            horario_recomendado = "03:00" if deve_irrigar else None
-            
-            # Compila todas as informações em um dicionário
-            recommendations.append({
-                "data": date,
-                "dia_semana": self._get_day_name(date),
-                "temperatura": round(temp, 1),
-                "probabilidade_chuva": round(prob_chuva, 1),
-                "chuva_prevista_mm": round(chuva_mm, 1),
-                "umidade_prevista": round(umidade_prevista, 1),
-                "deve_irrigar": deve_irrigar,
-                "horario_recomendado": horario_recomendado,
-                "recomendacao": recomendacao,
-                "justificativa": self._generate_justification(
-                    umidade_prevista, prob_chuva, chuva_mm
-                ),
-            })
-        
-        return pd.DataFrame(recommendations)
+
+        # Simula um estágio fenológico (em produção, isso viria de dados reais)
+        # Usa o estágio médio como aproximação
+        estagio = estagios[len(estagios) // 2]
+
+        # Extrai as colunas uma única vez como arrays NumPy: todo o cálculo
+        # numérico passa a ser vetorial, sem iterrows nem despachos por linha
+        datas = weather_df["data"].tolist()
+        temp = weather_df["temperatura"].to_numpy(dtype=np.float64)
+        prob_chuva = weather_df["probabilidade_chuva"].to_numpy(dtype=np.float64)
+        chuva_mm = weather_df["chuva_mm"].to_numpy(dtype=np.float64)
+
+        # Previsão simplificada de umidade e regras de negócio em lote:
+        # mesmos modelos empíricos dos métodos escalares, compilados com
+        # Numba quando disponível (ver kernels no topo do módulo)
+        umidade = _predict_umidity_np(temp, prob_chuva, chuva_mm)
+        deve_irrigar = _should_irrigate_np(umidade, prob_chuva, chuva_mm)
+
+        # Define horário recomendado (madrugada é mais eficiente para irrigação)
+        horario_recomendado = np.where(deve_irrigar, "03:00", None)
+
+        # Dias da semana: uma única conversão vetorizada de datas seguida de
+        # indexação na tabela de nomes, sem strptime por linha
+        weekdays = pd.to_datetime(weather_df["data"], errors="coerce").dt.weekday
+        weekdays = weekdays.fillna(-1).astype(np.int64).to_numpy()
+        dias_semana = [_WEEKDAYS_PT[w] if w >= 0 else "" for w in weekdays]
+
+        # Textos: única etapa ainda em Python, feita em compreensões sobre os
+        # arrays já calculados (sem lookups por campo)
+        recomendacoes = [
+            self._generate_recommendation_text(u, p, c, bool(d))
+            for u, p, c, d in zip(umidade, prob_chuva, chuva_mm, deve_irrigar)
+        ]
+        justificativas = _build_justifications(umidade, prob_chuva, chuva_mm)
+
+        colunas = {
+            "data": datas,
+            "dia_semana": dias_semana,
+            "temperatura": np.round(temp, 1),
+            "probabilidade_chuva": np.round(prob_chuva, 1),
+            "chuva_prevista_mm": np.round(chuva_mm, 1),
+            "umidade_prevista": np.round(umidade, 1),
+            "deve_irrigar": deve_irrigar,
+            "horario_recomendado": horario_recomendado,
+            "recomendacao": recomendacoes,
+            "justificativa": justificativas,
+        }
+
+        if as_arrow:
+            # Import tardio: pyarrow já acompanha o Streamlit, mas o módulo
+            # continua utilizável sem ele enquanto as_arrow não for pedido
+            import pyarrow as pa
+
+            # pa.array sobre ndarray numérico é zero-copy; strings e a coluna
+            # com None viram arrays Arrow com null nativo
+            return pa.table({nome: pa.array(valores) for nome, valores in colunas.items()})
+
+        if not return_df:
+            # Consumidor só itera: devolve os registros direto, sem pagar a
+            # construção do BlockManager do pandas
+            nomes = list(colunas)
+            return [dict(zip(nomes, valores)) for valores in zip(*colunas.values())]
+
+        # Monta o DataFrame final de uma vez, por colunas já tipadas
+        # columns= explícito fixa a ordem sem passo extra de inferência
+        return pd.DataFrame(colunas, columns=list(colunas))
     
     def _predict_umidity_simplified(self, temp, prob_chuva, chuva_mm):
         """
@@ -143,24 +364,13 @@ class IrrigationRecommendations:
         Returns:
             Umidade do solo prevista (%)
         """
-        # Umidade base típica
-        umidade_base = 30
-        umidade = umidade_base
-        
-        # Efeito da temperatura: temperatura alta reduz umidade (evaporação)
-        # Cada grau acima de 25°C reduz aproximadamente 0.8% de umidade
-        umidade -= (temp - 25) * 0.8
-        
-        # Efeito da chuva: chuva aumenta umidade diretamente
-        # Cada mm de chuva aumenta aproximadamente 1.5% de umidade
-        umidade += chuva_mm * 1.5
-        
-        # Efeito da probabilidade de chuva: indica condições que favorecem umidade
-        # Mesmo sem chuva real, alta probabilidade indica umidade do ar alta
-        umidade += (prob_chuva / 100) * 5
-        
-        # Limita umidade entre 10% e 50% (valores realistas)
-        return max(10, min(50, umidade))
+        # Delega para a forma vetorial (kernel compilado quando há Numba):
+        # a fórmula empírica vive em um único lugar
+        return float(
+            _predict_umidity_np(
+                np.array([temp]), np.array([prob_chuva]), np.array([chuva_mm])
+            )[0]
+        )
     
     def _should_irrigate(self, umidade, prob_chuva, chuva_mm):
         """
@@ -179,28 +389,13 @@ class IrrigationRecommendations:
         Returns:
             True se deve irrigar, False caso contrário
         """
-        # Regra 1: Não irrigar se umidade está adequada (> 30%)
-        # Umidade acima de 30% geralmente é suficiente para a maioria das culturas
-        if umidade > 30:
-            return False
-        
-        # Regra 2: Não irrigar se chuva alta está prevista
-        # Evita desperdício de água e energia se a chuva vai suprir a necessidade
-        if prob_chuva > 70 and chuva_mm > 5:
-            return False
-        
-        # Regra 3: Sempre irrigar se umidade está crítica (< 20%)
-        # Umidade muito baixa pode causar estresse hídrico e perda de produtividade
-        if umidade < 20:
-            return True
-        
-        # Regra 4: Irrigar se umidade está baixa e pouca chuva prevista
-        # Umidade entre 20-30% é subótima, mas se não há chuva prevista, deve irrigar
-        if umidade < 30 and (prob_chuva < 50 or chuva_mm < 3):
-            return True
-        
-        # Caso padrão: não irrigar (situação intermediária, monitorar)
-        return False
+        # Delega para a forma vetorial; a cascata de regras está documentada
+        # no kernel _should_irrigate_kernel no topo do módulo
+        return bool(
+            _should_irrigate_np(
+                np.array([umidade]), np.array([prob_chuva]), np.array([chuva_mm])
+            )[0]
+        )
     
     def _generate_recommendation_text(self, umidade, prob_chuva, chuva_mm, deve_irrigar):
         """
@@ -250,28 +445,10 @@ class IrrigationRecommendations:
         Returns:
             String com justificativa técnica
         """
-        justificativas = []
-        
-        # Classifica o nível de umidade
-        if umidade < 20:
-            justificativas.append(f"Umidade crítica ({umidade:.1f}%) - risco de estresse hídrico")
-        elif umidade < 30:
-            justificativas.append(f"Umidade abaixo do ideal ({umidade:.1f}%)")
-        else:
-            justificativas.append(f"Umidade adequada ({umidade:.1f}%)")
-        
-        # Classifica a probabilidade de chuva
-        if prob_chuva > 70:
-            justificativas.append(f"Alta probabilidade de chuva ({prob_chuva:.1f}%)")
-        elif prob_chuva > 50:
-            justificativas.append(f"Probabilidade moderada de chuva ({prob_chuva:.1f}%)")
-        
-        # Considera volume de chuva se significativo
-        if chuva_mm > 5:
-            justificativas.append(f"Volume de chuva significativo ({chuva_mm:.1f}mm)")
-        
-        # Junta todas as justificativas com separador
-        return " | ".join(justificativas)
+        # Delega para o gerador em lote (tabelas de templates do módulo)
+        return _build_justifications(
+            np.array([umidade]), np.array([prob_chuva]), np.array([chuva_mm])
+        )[0]
     
     def _get_day_name(self, date_str):
         """
@@ -285,9 +462,5 @@ class IrrigationRecommendations:
         Returns:
             Nome do dia da semana em português ou string vazia se erro
         """
-        try:
-            date = datetime.strptime(date_str, "%Y-%m-%d")
-            days = ["Segunda", "Terça", "Quarta", "Quinta", "Sexta", "Sábado", "Domingo"]
-            return days[date.weekday()]
-        except:
-            return ""
+        # Delega para a função memoizada do módulo (tabela _WEEKDAYS_PT)
+        return _day_name(date_str)
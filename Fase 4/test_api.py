@@ -6,6 +6,7 @@ estão sendo carregados corretamente para todos os municípios cadastrados.
 """
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Adiciona o diretório atual ao path para importar módulos
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -43,35 +44,52 @@ def test_api():
     print()
     
     # Testa cada município cadastrado
+    # As previsões são buscadas em paralelo: cada chamada é um round-trip
+    # HTTP (timeout de 10s) e o requests libera o GIL durante o I/O de
+    # socket, então o tempo total cai de N × latência para ~1 latência
     municipios = config.MUNICIPIOS_CADASTRADOS
     resultados = []
-    
+    previsoes = {}
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        futures = {
+            pool.submit(weather_api.get_weather_forecast, municipio, days=7): municipio
+            for municipio in municipios
+            if weather_api.get_city_coordinates(municipio)
+        }
+        for future in as_completed(futures):
+            municipio = futures[future]
+            try:
+                previsoes[municipio] = (future.result(), None)
+            except Exception as e:
+                previsoes[municipio] = (None, e)
+
+    # Imprime o relatório depois de coletar tudo, na ordem original dos
+    # municípios, evitando stdout intercalado entre as threads
     for municipio in municipios:
         print(f"Testando: {municipio}...", end=" ")
-        
+
         # Verifica coordenadas
         coords = weather_api.get_city_coordinates(municipio)
         if not coords:
             print(f"[ERRO] Coordenadas nao encontradas")
             resultados.append((municipio, False, "Coordenadas nao encontradas"))
             continue
-        
-        # Tenta obter previsão
-        try:
-            weather_df = weather_api.get_weather_forecast(municipio, days=7)
-            
-            if weather_df is not None and len(weather_df) > 0:
-                print(f"[OK] {len(weather_df)} dias de previsao")
-                print(f"   Temperatura media: {weather_df['temperatura'].mean():.1f}C")
-                print(f"   Probabilidade de chuva media: {weather_df['probabilidade_chuva'].mean():.1f}%")
-                resultados.append((municipio, True, f"{len(weather_df)} dias"))
-            else:
-                print(f"[ERRO] Falha - Nenhum dado retornado")
-                resultados.append((municipio, False, "Nenhum dado retornado"))
-        except Exception as e:
-            print(f"[ERRO] Erro: {str(e)}")
-            resultados.append((municipio, False, str(e)))
-        
+
+        weather_df, erro = previsoes.get(municipio, (None, None))
+
+        if erro is not None:
+            print(f"[ERRO] Erro: {str(erro)}")
+            resultados.append((municipio, False, str(erro)))
+        elif weather_df is not None and len(weather_df) > 0:
+            print(f"[OK] {len(weather_df)} dias de previsao")
+            print(f"   Temperatura media: {weather_df['temperatura'].mean():.1f}C")
+            print(f"   Probabilidade de chuva media: {weather_df['probabilidade_chuva'].mean():.1f}%")
+            resultados.append((municipio, True, f"{len(weather_df)} dias"))
+        else:
+            print(f"[ERRO] Falha - Nenhum dado retornado")
+            resultados.append((municipio, False, "Nenhum dado retornado"))
+
         print()
     
     # Resumo dos resultados
@@ -7,11 +7,258 @@ Os dados meteorológicos são essenciais para o sistema de recomendações de ir
 pois chuva prevista e temperatura influenciam diretamente a decisão de quando irrigar.
 Retorna None quando a API não está disponível.
 """
+import logging
+import unicodedata
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
+from joblib import Memory
 import config
 
+# orjson decodifica JSON em C, várias vezes mais rápido que o json da
+# biblioteca padrão nas respostas de previsão (listas numéricas longas);
+# se não estiver instalado, caímos no json padrão com a mesma interface
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+
+def _make_session():
+    """
+    Cria a sessão HTTP compartilhada, com keep-alive, pool e retries.
+
+    Reutilizar a conexão TCP/TLS entre requisições elimina ~2 RTTs de
+    handshake por chamada (dominantes em consultas multi-cidade); o Retry
+    cobre instabilidades transitórias do lado da API.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=16,
+        max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+    )
+    session.mount("https://", adapter)
+    # Resposta comprimida no fio: encolhe bastante o JSON de previsão
+    session.headers["Accept-Encoding"] = "gzip"
+    return session
+
+
+# Logger do módulo: os erros saem com formatação tardia (%s só é montado se
+# o nível estiver habilitado) e sem flush síncrono de stdout no caminho quente
+logger = logging.getLogger(__name__)
+
+# Sessão única do módulo, compartilhada por todas as chamadas à API
+_SESSION = _make_session()
+
+# Parâmetros fixos da consulta de previsão, montados uma única vez no import;
+# cada chamada só acrescenta os que variam (latitude, longitude, dias) e deixa
+# a codificação da query string para o urllib3
+# Categorias possíveis da coluna descricao, em ordem crescente de chuva
+# Como categórica, a coluna guarda códigos int8 + esta tabela compartilhada
+# (em vez de um objeto str por linha) e agrupamentos ficam mais baratos
+_DESCRICAO_CATS = (
+    "ceu claro",
+    "possibilidade de chuva",
+    "chuva moderada",
+    "chuva intensa",
+)
+
+_FORECAST_PARAMS = {
+    "daily": "temperature_2m_max,temperature_2m_min,precipitation_sum,"
+             "precipitation_probability_max",
+    "hourly": "relative_humidity_2m",
+    "timezone": "America/Sao_Paulo",
+}
+
+# Cache em disco das respostas da API, compartilhado entre processos
+# A chave inclui um "balde" de data/hora, então cada previsão (lat, lon, dias)
+# é buscada na rede no máximo uma vez por hora; nas demais chamadas a resposta
+# vem do cache (página de disco já quente no SO)
+_mem = Memory(config.CACHE_DIR, mmap_mode="r", verbose=0)
+
+def _normalize_city(name):
+    """
+    Normaliza o nome de uma cidade para uso como chave de busca.
+
+    Decompõe acentos via NFKD e descarta os diacríticos, além de baixar a
+    caixa e remover espaços das pontas: "São Paulo ", "sao paulo" e
+    "SÃO PAULO" viram todos "sao paulo".
+
+    Args:
+        name: Nome da cidade como digitado/recebido
+
+    Returns:
+        Nome normalizado (ascii, minúsculas, sem espaços nas pontas)
+    """
+    return (
+        unicodedata.normalize("NFKD", name)
+        .encode("ascii", "ignore")
+        .decode()
+        .strip()
+        .lower()
+    )
+
+
+# Tabela de coordenadas dos municípios cadastrados, em forma colunar
+# (structure-of-arrays): nomes em uma tupla e pares lat/lon em um único
+# array float32. Além de construir o dicionário de lookup abaixo, permite
+# consultas vetoriais sobre todas as cidades de uma vez (ver nearest_city)
+_CITY_TABLE = (
+    ("São Paulo", -23.5505, -46.6333),
+    ("Campinas", -22.9056, -47.0608),
+    ("Ribeirão Preto", -21.1775, -47.8103),
+    ("Piracicaba", -22.7253, -47.6493),
+    ("Londrina", -23.3045, -51.1696),
+    ("Cascavel", -24.9558, -53.4553),
+    ("Maringá", -23.4205, -51.9334),
+)
+_CITY_NAMES = tuple(nome for nome, _, _ in _CITY_TABLE)
+_CITY_LL = np.array([[lat, lon] for _, lat, lon in _CITY_TABLE], dtype=np.float32)
+
+# Dicionário de lookup por nome, construído uma única vez no import
+# Chaves pré-normalizadas com _normalize_city, então a busca tolera caixa,
+# espaços e acentos (com ou sem) e continua sendo um único lookup O(1)
+_CITY_COORDS = {
+    _normalize_city(nome): (lat, lon) for nome, lat, lon in _CITY_TABLE
+}
+
+
+def _to_f32(values, n, default):
+    """
+    Converte uma lista diária da API em array float32 de tamanho n.
+
+    np.fromiter com count escreve direto no buffer de destino, sem a cópia
+    temporária (e o walk extra da lista) que values[:n] + asarray fariam.
+    Valores ausentes no fim da lista são completados com o mesmo padrão da
+    versão escalar, para que a aritmética vetorial não mude o resultado.
+
+    Args:
+        values: Lista de valores diários retornada pela API (pode ser menor que n)
+        n: Número de dias desejado
+        default: Valor usado para completar posições ausentes
+
+    Returns:
+        Array float32 de tamanho n
+    """
+    m = min(n, len(values))
+    arr = np.fromiter(values, dtype=np.float32, count=m)
+    if m < n:
+        arr = np.concatenate([arr, np.full(n - m, default, dtype=np.float32)])
+    return arr
+
+
+def _hourly_humidity_means(hourly_values, n):
+    """
+    Agrega a umidade horária em médias diárias, vetorialmente.
+
+    Em vez de fatiar e somar em Python a cada dia, remodela o array em
+    (dias, 24) e tira a média por linha em uma única passada C. Dias sem
+    leituras recebem o padrão 60%, como na versão escalar; um eventual dia
+    parcial no fim da série usa a média das horas disponíveis.
+
+    Args:
+        hourly_values: Lista de leituras horárias de umidade relativa
+        n: Número de dias de previsão
+
+    Returns:
+        Array float32 de tamanho n com a umidade média de cada dia
+    """
+    arr = np.asarray(hourly_values, dtype=np.float32)
+    umidade = np.full(n, 60.0, dtype=np.float32)
+
+    full_days = min(arr.size // 24, n)
+    if full_days > 0:
+        umidade[:full_days] = arr[: full_days * 24].reshape(full_days, 24).mean(axis=1)
+
+    # Dia parcial: menos de 24 leituras após os dias completos
+    if full_days < n and arr.size > full_days * 24:
+        umidade[full_days] = arr[full_days * 24:].mean()
+
+    return umidade
+
+
+@lru_cache(maxsize=32)
+def _coords_for(city):
+    """
+    Busca memoizada de coordenadas por nome de cidade.
+
+    O lru_cache guarda o resultado por string exata recebida, então a
+    normalização NFKD + lowercase roda uma única vez por grafia distinta —
+    nas re-renderizações do dashboard a mesma meia dúzia de nomes se repete
+    e a chamada vira um único probe de dicionário.
+
+    Args:
+        city: Nome da cidade como recebido
+
+    Returns:
+        Tupla (latitude, longitude) ou None se cidade não cadastrada
+    """
+    return _CITY_COORDS.get(_normalize_city(city))
+
+
+@_mem.cache
+def _fetch_openmeteo(base_url, lat, lon, days, date_bucket):
+    """
+    Busca a previsão bruta (JSON) na API Open-Meteo para as coordenadas dadas.
+
+    Função de módulo (e não método) para poder ser memoizada pelo
+    joblib.Memory. O parâmetro date_bucket participa apenas da chave do
+    cache: com granularidade de hora, entradas antigas expiram sozinhas.
+
+    Args:
+        base_url: URL base da API de previsão
+        lat: Latitude da localização
+        lon: Longitude da localização
+        days: Número de dias de previsão
+        date_bucket: String de data/hora que delimita a validade do cache
+
+    Returns:
+        Dicionário JSON da API
+
+    Raises:
+        requests.HTTPError: se a API responder com status diferente de 200
+            (falhas não entram no cache; ver comentário abaixo)
+    """
+    # Timeouts separados de conexão/leitura: falha rápido em host morto sem
+    # encurtar o tempo de leitura da resposta
+    response = _SESSION.get(
+        base_url,
+        params={**_FORECAST_PARAMS, "latitude": lat, "longitude": lon, "forecast_days": days},
+        timeout=(3.05, 10),
+    )
+
+    if response.status_code != 200:
+        # Levanta em vez de retornar None: nem o joblib.Memory nem o
+        # lru_cache gravam entradas quando a função falha, então um erro
+        # transitório (ex.: 429/500) não apaga a previsão da cidade pela
+        # janela de TTL inteira — a próxima chamada tenta a rede de novo.
+        # O except de get_weather_forecast converte o erro em None
+        raise requests.HTTPError(
+            f"Status {response.status_code} da API Open-Meteo", response=response
+        )
+
+    # Decodifica os bytes crus direto (sem passar por response.json()),
+    # deixando o parse para o orjson quando disponível
+    return _json.loads(response.content)
+
+
+@lru_cache(maxsize=64)
+def _fetch_openmeteo_hot(base_url, lat, lon, days, date_bucket):
+    """
+    Camada LRU em memória sobre o cache em disco de _fetch_openmeteo.
+
+    Dentro de um mesmo processo (ex.: re-renderizações do dashboard), evita
+    até o round-trip ao cache em disco.
+    """
+    return _fetch_openmeteo(base_url, lat, lon, days, date_bucket)
+
+
 class WeatherAPI:
     """
     Classe para consultar dados meteorológicos usando Open-Meteo API.
@@ -29,8 +276,9 @@ class WeatherAPI:
             api_key: Não utilizado (mantido para compatibilidade)
         """
         # Open-Meteo não requer chave de API
+        # O cache de respostas é mantido no nível do módulo (joblib.Memory),
+        # então a instância não carrega estado próprio de cache
         self.base_url = "https://api.open-meteo.com/v1/forecast"
-        self.cache = {}
     
     def get_weather_forecast(self, city, country="BR", days=7):
         """
@@ -64,48 +312,101 @@ class WeatherAPI:
         try:
             # Limita dias a 16 (limite da API gratuita)
             days = min(days, 16)
-            
-            # Monta URL da API Open-Meteo
-            # Parâmetros: latitude, longitude, variáveis meteorológicas, dias de previsão
+
+            # Busca via camada de cache (memória + disco): a rede só é
+            # acionada uma vez por janela de TTL para esta chave; o "balde"
+            # é o número da janela atual e muda quando o TTL expira
             # Nota: relative_humidity_2m não está disponível em daily, usamos hourly e agregamos
-            url = (
-                f"{self.base_url}?"
-                f"latitude={lat}&longitude={lon}&"
-                f"daily=temperature_2m_max,temperature_2m_min,precipitation_sum,precipitation_probability_max&"
-                f"hourly=relative_humidity_2m&"
-                f"timezone=America/Sao_Paulo&"
-                f"forecast_days={days}"
-            )
-            
-            response = requests.get(url, timeout=10)
-            
+            ttl = max(1, int(config.WEATHER_CACHE_TTL_SECONDS))
+            date_bucket = int(datetime.utcnow().timestamp() // ttl)
+            data = _fetch_openmeteo_hot(self.base_url, lat, lon, days, date_bucket)
+
             # Se a requisição foi bem-sucedida, processa os dados
-            if response.status_code == 200:
-                data = response.json()
-                return self._parse_openmeteo_data(data, days)
-            else:
+            if data is None:
                 # Se houver erro na API, retorna None
                 return None
-        
+
+            return self._parse_openmeteo_data(data, days)
+
         except Exception as e:
             # Em caso de qualquer erro (timeout, conexão, etc), retorna None
-            print(f"Erro ao consultar API: {e}")
+            logger.warning("Erro ao consultar API: %s", e)
             return None
     
+    def get_weather_forecast_many(self, cities, days=7):
+        """
+        Obtém previsões para várias cidades de uma vez, em paralelo.
+
+        Cada consulta é um round-trip HTTP independente e o requests libera
+        o GIL durante o I/O de socket, então buscar as cidades em threads
+        reduz o tempo total de N × latência para ~1 latência (limitado pelo
+        pool de conexões da sessão). As camadas de cache continuam valendo:
+        cidades já consultadas na última hora nem vão à rede.
+
+        Args:
+            cities: Lista de nomes de cidades
+            days: Número de dias de previsão (padrão: 7)
+
+        Returns:
+            Dicionário {cidade: DataFrame de previsão ou None}, preservando
+            a semântica de get_weather_forecast para cada cidade
+        """
+        resultados = {}
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            futures = {
+                city: pool.submit(self.get_weather_forecast, city, days=days)
+                for city in cities
+            }
+            for city, future in futures.items():
+                try:
+                    resultados[city] = future.result()
+                except Exception as e:
+                    # Mesmo contrato do caminho unitário: falha vira None
+                    logger.warning("Erro ao consultar API para %s: %s", city, e)
+                    resultados[city] = None
+        return resultados
+
     def _parse_openmeteo_data(self, data, days):
         """
         Processa e formata dados retornados pela API Open-Meteo.
-        
+
         A API retorna previsões diárias já agregadas. Este método formata os dados
         para o formato esperado pelo sistema.
-        
+
         Args:
             data: Dicionário JSON retornado pela API
             days: Número de dias desejados
-        
+
         Returns:
             DataFrame com previsões diárias
         """
+        cols = self._parse_openmeteo_columns(data, days)
+
+        if cols is None:
+            return None
+
+        # Monta o DataFrame de uma vez, por colunas já tipadas: evita a
+        # inferência dtype linha a linha do caminho lista-de-dicionários
+        # copy=False reaproveita os arrays já alocados pelo parser
+        return pd.DataFrame(cols, copy=False)
+
+    def _parse_openmeteo_columns(self, data, days):
+        """
+        Processa a resposta da API em colunas NumPy, sem montar DataFrame.
+
+        Consumidores internos que só precisam dos agregados numéricos podem
+        usar este dicionário direto e pular a alocação do BlockManager do
+        pandas — a etapa mais cara da construção do DataFrame. O formato e
+        os padrões de cada coluna são os mesmos do DataFrame público.
+
+        Args:
+            data: Dicionário JSON retornado pela API
+            days: Número de dias desejados
+
+        Returns:
+            Dicionário {nome da coluna: array/lista de valores} ou None se
+            a resposta não tiver dados utilizáveis
+        """
         daily = data.get("daily", {})
         
         if not daily or "time" not in daily:
@@ -113,70 +414,54 @@ class WeatherAPI:
         
         # Verifica se há dados suficientes
         if len(daily["time"]) == 0:
-            print("Debug: Lista de 'time' vazia")
+            logger.debug("Lista de 'time' vazia na resposta da API")
             return None
         
-        forecasts = []
-        
-        # Itera sobre os dias retornados
         num_days = min(len(daily["time"]), days)
-        for i in range(num_days):
-            # Calcula temperatura média (média entre máxima e mínima)
-            temp_max_list = daily.get("temperature_2m_max", [])
-            temp_min_list = daily.get("temperature_2m_min", [])
-            
-            temp_max = temp_max_list[i] if i < len(temp_max_list) else 25
-            temp_min = temp_min_list[i] if i < len(temp_min_list) else 15
-            temperatura = (temp_max + temp_min) / 2
-            
-            # Extrai outros dados
-            chuva_list = daily.get("precipitation_sum", [])
-            prob_chuva_list = daily.get("precipitation_probability_max", [])
-            
-            # Calcula umidade média do dia usando dados horários
-            hourly = data.get("hourly", {})
-            umidade_hourly = hourly.get("relative_humidity_2m", [])
-            if umidade_hourly:
-                # Calcula média das 24 horas do dia (índices i*24 até (i+1)*24)
-                start_idx = i * 24
-                end_idx = min((i + 1) * 24, len(umidade_hourly))
-                if end_idx > start_idx:
-                    umidade = sum(umidade_hourly[start_idx:end_idx]) / (end_idx - start_idx)
-                else:
-                    umidade = 60
-            else:
-                umidade = 60
-            
-            chuva_mm = chuva_list[i] if i < len(chuva_list) else 0
-            prob_chuva = prob_chuva_list[i] if i < len(prob_chuva_list) else 0
-            
-            # Gera descrição baseada na probabilidade de chuva
-            if prob_chuva > 70:
-                descricao = "chuva intensa"
-            elif prob_chuva > 50:
-                descricao = "chuva moderada"
-            elif prob_chuva > 30:
-                descricao = "possibilidade de chuva"
-            else:
-                descricao = "ceu claro"
-            
-            forecasts.append({
-                "data": daily["time"][i],
-                "temperatura": round(temperatura, 1),
-                "umidade": round(umidade, 1),
-                "probabilidade_chuva": round(prob_chuva, 1),
-                "chuva_mm": round(chuva_mm, 1),
-                "descricao": descricao,
-            })
-        
-        # Converte lista de dicionários em DataFrame
-        if len(forecasts) == 0:
+
+        # Sem dias a processar, sai antes de alocar qualquer array ou
+        # montar DataFrame (ex.: days <= 0 vindo do chamador)
+        if num_days == 0:
             return None
-        
-        df = pd.DataFrame(forecasts)
-        
-        return df
-    
+
+        # Promove as listas diárias a arrays NumPy uma única vez: a
+        # aritmética passa a ser vetorial (uma operação C por coluna), sem
+        # fatiamento e sum() do interpretador a cada dia
+        temp_max = _to_f32(daily.get("temperature_2m_max", []), num_days, 25.0)
+        temp_min = _to_f32(daily.get("temperature_2m_min", []), num_days, 15.0)
+        chuva = _to_f32(daily.get("precipitation_sum", []), num_days, 0.0)
+        prob = _to_f32(daily.get("precipitation_probability_max", []), num_days, 0.0)
+
+        # Temperatura média (média entre máxima e mínima), para todos os dias
+        temperatura = (temp_max + temp_min) / 2
+
+        # Umidade média diária agregada dos dados horários via reshape
+        # (relative_humidity_2m só existe em hourly na API)
+        hourly = data.get("hourly", {})
+        umidade = _hourly_humidity_means(hourly.get("relative_humidity_2m", []), num_days)
+
+        # Gera descrição baseada na probabilidade de chuva: np.select avalia
+        # a escada de condições (>70, >50, >30) em uma única operação
+        # vetorizada, com os mesmos limiares estritos da versão escalar
+        descricoes = np.select(
+            [prob > 70, prob > 50, prob > 30],
+            ["chuva intensa", "chuva moderada", "possibilidade de chuva"],
+            default="ceu claro",
+        )
+
+        # Colunas numéricas em float32: já arredondadas a 1 casa, metade da
+        # banda de memória do float64 sem perda observável para exibição
+        return {
+            "data": list(daily["time"][:num_days]),
+            "temperatura": np.round(temperatura, 1).astype(np.float32, copy=False),
+            "umidade": np.round(umidade, 1).astype(np.float32, copy=False),
+            "probabilidade_chuva": np.round(prob, 1).astype(np.float32, copy=False),
+            "chuva_mm": np.round(chuva, 1).astype(np.float32, copy=False),
+            "descricao": pd.Categorical(
+                descricoes, categories=list(_DESCRICAO_CATS), ordered=True
+            ),
+        }
+
     def get_city_coordinates(self, city):
         """
         Retorna coordenadas geográficas (latitude, longitude) de uma cidade.
@@ -190,20 +475,30 @@ class WeatherAPI:
         Returns:
             Tupla (latitude, longitude) ou None se cidade não encontrada
         """
-        # Dicionário completo com coordenadas de todos os municípios cadastrados
-        cities_coords = {
-            "São Paulo": (-23.5505, -46.6333),
-            "Campinas": (-22.9056, -47.0608),
-            "Ribeirão Preto": (-21.1775, -47.8103),
-            "Piracicaba": (-22.7253, -47.6493),
-            "Londrina": (-23.3045, -51.1696),
-            "Cascavel": (-24.9558, -53.4553),
-            "Maringá": (-23.4205, -51.9334),
-        }
-        
-        # Retorna coordenadas da cidade ou None se não encontrada
-        return cities_coords.get(city)
+        # Delega para a função memoizada do módulo: a normalização só roda
+        # na primeira consulta de cada grafia
+        return _coords_for(city)
     
+    def nearest_city(self, lat, lon):
+        """
+        Retorna o município cadastrado mais próximo de uma coordenada.
+
+        Útil para associar uma leitura de GPS (ex.: sensor em campo) ao
+        município cadastrado. A distância é calculada vetorialmente sobre
+        o array de coordenadas de todas as cidades em uma única operação
+        NumPy; para a escala de graus envolvida, a distância euclidiana
+        quadrática preserva a ordenação (não é preciso haversine).
+
+        Args:
+            lat: Latitude da localização
+            lon: Longitude da localização
+
+        Returns:
+            Nome do município cadastrado mais próximo
+        """
+        d2 = (_CITY_LL[:, 0] - lat) ** 2 + (_CITY_LL[:, 1] - lon) ** 2
+        return _CITY_NAMES[int(np.argmin(d2))]
+
     def test_api_connection(self):
         """
         Testa a conexão com a API Open-Meteo.
@@ -216,21 +511,28 @@ class WeatherAPI:
             True se a API está funcionando, False caso contrário
         """
         try:
-            # Testa com coordenadas de São Paulo
-            url = (
-                f"{self.base_url}?"
-                f"latitude=-23.5505&longitude=-46.6333&"
-                f"daily=temperature_2m_max&"
-                f"timezone=America/Sao_Paulo&"
-                f"forecast_days=1"
-            )
-            response = requests.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                return True
-            else:
-                print(f"Erro na API: Status {response.status_code}")
+            # Testa com coordenadas de São Paulo, pedindo o mínimo (1 dia,
+            # uma variável) — é só uma sonda de conectividade
+            # Usa a sessão compartilhada do módulo: reaproveita a conexão
+            # TCP/TLS do pool (e pré-aquece o pool para as buscas seguintes)
+            # stream=True: a resposta é considerada entregue nos headers e o
+            # corpo nunca é baixado — uma sonda de vida não precisa do JSON
+            with _SESSION.get(
+                self.base_url,
+                params={
+                    "latitude": -23.5505,
+                    "longitude": -46.6333,
+                    "daily": "temperature_2m_max",
+                    "timezone": "America/Sao_Paulo",
+                    "forecast_days": 1,
+                },
+                timeout=(3.05, 5),
+                stream=True,
+            ) as response:
+                if response.ok:
+                    return True
+                logger.warning("Erro na API: Status %s", response.status_code)
                 return False
         except Exception as e:
-            print(f"Erro ao testar conexão com API: {e}")
+            logger.warning("Erro ao testar conexão com API: %s", e)
             return False